@@ -5,7 +5,7 @@ Maps ingredients to molecules and builds comprehensive flavor profiles.
 
 import json
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 import numpy as np
 
@@ -15,15 +15,19 @@ from ..data.flavor_loader import FlavorLoader
 class MolecularProfiler:
     """Analyze ingredients at the molecular level."""
 
-    def __init__(self, data_dir: str = "raw"):
+    def __init__(self, data_dir: str = "raw", flavor_loader: Optional[FlavorLoader] = None):
         """
         Initialize molecular profiler.
 
         Args:
             data_dir: Directory containing raw data files
+            flavor_loader: Already-loaded FlavorLoader to reuse instead of
+                parsing FlavorDB again
         """
-        self.flavor_loader = FlavorLoader(data_dir)
-        self.flavor_loader.load_flavor_db()
+        if flavor_loader is None:
+            flavor_loader = FlavorLoader(data_dir)
+            flavor_loader.load_flavor_db()
+        self.flavor_loader = flavor_loader
         print(f"Loaded {len(self.flavor_loader.all_molecules)} molecules")
 
         # Cache for ingredient profiles
@@ -240,14 +244,15 @@ class MolecularProfiler:
 class CocktailAnalyzer:
     """Analyze complete cocktails at the molecular level."""
 
-    def __init__(self, data_dir: str = "raw"):
+    def __init__(self, data_dir: str = "raw", profiler: Optional[MolecularProfiler] = None):
         """
         Initialize cocktail analyzer.
 
         Args:
             data_dir: Directory containing data files
+            profiler: Existing MolecularProfiler to share
         """
-        self.profiler = MolecularProfiler(data_dir)
+        self.profiler = profiler if profiler is not None else MolecularProfiler(data_dir)
 
         # Load processed cocktail data
         processed_cocktails = Path("data/processed/cocktails_processed.json")
@@ -15,15 +15,19 @@ from ..analysis.molecular_profile import MolecularProfiler, CocktailAnalyzer
 class CocktailModifier:
     """Modify cocktails and predict flavor impact."""
 
-    def __init__(self, data_dir: str = "raw"):
+    def __init__(self, data_dir: str = "raw",
+                 profiler: Optional[MolecularProfiler] = None,
+                 analyzer: Optional[CocktailAnalyzer] = None):
         """
         Initialize cocktail modifier.
 
         Args:
             data_dir: Directory containing data files
+            profiler: Existing MolecularProfiler to share
+            analyzer: Existing CocktailAnalyzer to share
         """
-        self.profiler = MolecularProfiler(data_dir)
-        self.analyzer = CocktailAnalyzer(data_dir)
+        self.profiler = profiler if profiler is not None else MolecularProfiler(data_dir)
+        self.analyzer = analyzer if analyzer is not None else CocktailAnalyzer(data_dir)
 
         # Load ingredient list for recommendations
         ingredient_file = Path("data/processed/ingredients_list.json")
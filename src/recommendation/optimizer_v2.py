@@ -9,18 +9,34 @@ Improvements over V1:
 - Spirit fallback mappings
 """
 
+import bisect
+import functools
 import json
+import math
+import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
 import numpy as np
 from collections import defaultdict
 
+try:
+    import orjson  # Optional: faster JSON parsing
+except ImportError:
+    orjson = None
+
 from ..analysis.molecular_profile import MolecularProfiler, CocktailAnalyzer
 from ..recommendation.optimizer import CocktailModifier
 
 
+def _canon(name: str) -> str:
+    """Canonical ingredient name: stripped, lowercase and interned."""
+    return sys.intern(name.strip().lower())
+
+
 # Enhanced spirit mappings for better ingredient coverage
-SPIRIT_FALLBACK_MAPPINGS = {
+_RAW_SPIRIT_FALLBACK_MAPPINGS = {
     'rum': ['sugar cane', 'molasses'],
     'light rum': ['sugar cane', 'citrus'],
     'dark rum': ['molasses', 'caramel', 'vanilla'],
@@ -46,49 +62,190 @@ SPIRIT_FALLBACK_MAPPINGS = {
     'club soda': ['water'],
 }
 
+# Read-only view with canonical keys and tuple values
+SPIRIT_FALLBACK_MAPPINGS = MappingProxyType({
+    _canon(spirit): tuple(bases)
+    for spirit, bases in _RAW_SPIRIT_FALLBACK_MAPPINGS.items()
+})
+
+# Placeholder impact estimate attached to every suggestion
+_PREDICTED_IMPACT_STR = "+0.15"
+
+# Fixed taste dimension order for packed score arrays
+TASTE_DIMS = ('sweet', 'sour', 'bitter', 'aromatic', 'savory')
+
+# Corrective ingredient candidates by taste dimension (canonical names)
+DIMENSION_INGREDIENTS = {
+    'sweet': ['simple syrup', 'honey', 'agave syrup', 'sugar'],
+    'sour': ['lemon juice', 'lime juice', 'grapefruit juice'],
+    'bitter': ['angostura bitters', 'campari', 'coffee'],
+    'aromatic': ['mint', 'basil', 'bitters'],
+    'savory': ['celery', 'tomato juice'],
+}
+
+# Dimension whose ingredients offset a dimension that is too high
+_CONTRASTING = {
+    'sweet': 'sour',
+    'sour': 'sweet',
+    'bitter': 'sweet',
+    'aromatic': 'sweet',
+    'savory': 'sweet',
+}
+
+# Candidate ingredients per dimension, resolved for each issue type
+_TOO_LOW = {dim: tuple(ings) for dim, ings in DIMENSION_INGREDIENTS.items()}
+_TOO_HIGH = {dim: _TOO_LOW[_CONTRASTING[dim]] for dim in DIMENSION_INGREDIENTS}
+
+# Auto-detected imbalances: a score more than _IMBALANCE_STD_FACTOR stds
+# above the mean is too high; one as far below it is too low only if it is
+# also under _TOO_LOW_MAX
+_IMBALANCE_STD_FACTOR = 0.7  # Stricter threshold
+_TOO_LOW_MAX = 0.3
+
+# Adaptive amount balance factors: a balance >= _BAL_EDGES[i] moves to the
+# next (smaller) factor, i.e. <0.80 -> 1.0, ..., >=0.98 -> 0.0
+_BAL_EDGES = (0.80, 0.90, 0.95, 0.98)
+_BAL_FACTORS = (1.0, 0.75, 0.5, 0.25, 0.0)
+
+# Array forms for the batch (vectorized) path
+_BAL_EDGES_ARR = np.array(_BAL_EDGES)
+_BAL_FACTORS_ARR = np.array(_BAL_FACTORS)
+
+
+def _scores_array(scores: Dict[str, float]) -> np.ndarray:
+    """Pack a taste-score dict into a float64 array (dict order)."""
+    return np.fromiter(scores.values(), dtype=np.float64, count=len(scores))
+
+
+def _auto_imbalance(dimension: str, issue_type: str, score: float) -> Dict:
+    """Imbalance entry for a dimension flagged by the score statistics."""
+    return {
+        'dimension': dimension,
+        'type': issue_type,
+        'priority': 'medium',
+        'current_value': score,
+    }
+
+
+def _mean_std(values: List[float]) -> tuple[float, float]:
+    """Population mean and std of a handful of taste scores (no NumPy dispatch)."""
+    n = len(values)
+    mean = math.fsum(values) / n
+    std = math.sqrt(math.fsum((v - mean) ** 2 for v in values) / n)
+    return mean, std
+
+
+class _SpiritFallbackMatcher:
+    """
+    Memoized replacement for FlavorLoader._fuzzy_match_ingredient.
+
+    Falls back to precomputed spirit molecule lists when the original
+    keyword matching finds nothing.
+    """
+
+    def __init__(self, original_fuzzy, spirit_molecules: Dict[str, List[Dict]]):
+        self.original_fuzzy = original_fuzzy
+        self.spirit_molecules = spirit_molecules
+        self._match = functools.lru_cache(maxsize=512)(self._match_uncached)
+
+    def __call__(self, ingredient: str) -> List[Dict]:
+        return self._match(ingredient)
+
+    def _match_uncached(self, ingredient: str) -> List[Dict]:
+        molecules = self.original_fuzzy(ingredient)
+
+        # If still empty, try spirit mappings
+        if not molecules:
+            molecules = self.spirit_molecules.get(_canon(ingredient), molecules)
+
+        return molecules
+
 
 class FlavorOptimizerV2:
     """
     Improved recommendation engine with adaptive amounts and smart thresholds.
     """
 
+    # Parsed ingredient lists by path, shared by all instances
+    _cached_ingredients: Dict[str, tuple] = {}
+
     def __init__(self, data_dir: str = "raw"):
         """Initialize improved optimizer."""
         self.profiler = MolecularProfiler(data_dir)
         self.analyzer = CocktailAnalyzer(data_dir)
         self.modifier = CocktailModifier(data_dir)
 
+        # Candidate ingredient profiles, keyed by canonical name. Unlike the
+        # profiler's own cache this also remembers ingredients with no data.
+        self._profile_cache: Dict[str, Dict] = {}
+
+        # Packed candidate taste scores per candidate tuple
+        self._candidate_tables: Dict[tuple, tuple] = {}
+
         # Enhance profiler with spirit mappings
         self._enhance_ingredient_mappings()
 
         # Load ingredient list
-        ingredient_file = Path("data/processed/ingredients_list.json")
-        if ingredient_file.exists():
-            with open(ingredient_file, 'r', encoding='utf-8') as f:
-                self.available_ingredients = json.load(f)
-        else:
-            self.available_ingredients = []
+        self.available_ingredients = self._load_ingredients(
+            Path("data/processed/ingredients_list.json")
+        )
+
+    @classmethod
+    def _load_ingredients(cls, ingredient_file: Path) -> tuple:
+        """Load the ingredient list once per process (empty if missing)."""
+        key = str(ingredient_file)
+        if key not in cls._cached_ingredients:
+            if not ingredient_file.exists():
+                return ()
+            data = ingredient_file.read_bytes()
+            ingredients = orjson.loads(data) if orjson else json.loads(data)
+            cls._cached_ingredients[key] = tuple(map(_canon, ingredients))
+        return cls._cached_ingredients[key]
 
     def _enhance_ingredient_mappings(self):
         """Add fallback mappings for spirits and liqueurs."""
-        # Extend the flavor loader's fuzzy matching
-        original_fuzzy = self.profiler.flavor_loader._fuzzy_match_ingredient
+        flavor_loader = self.profiler.flavor_loader
+
+        # Concatenate each spirit's base molecules once, up front
+        spirit_molecules = {}
+        for spirit, bases in SPIRIT_FALLBACK_MAPPINGS.items():
+            molecules = []
+            for base in bases:
+                molecules.extend(flavor_loader.molecules_by_source.get(base.lower(), []))
+            spirit_molecules[spirit] = molecules
 
-        def enhanced_fuzzy_match(ingredient: str):
-            # Try original
-            molecules = original_fuzzy(ingredient)
+        # Monkey patch (not ideal but works for proof-of-concept)
+        flavor_loader._fuzzy_match_ingredient = _SpiritFallbackMatcher(
+            flavor_loader._fuzzy_match_ingredient, spirit_molecules
+        )
 
-            # If still empty, try spirit mappings
-            if not molecules and ingredient.lower() in SPIRIT_FALLBACK_MAPPINGS:
-                for base in SPIRIT_FALLBACK_MAPPINGS[ingredient.lower()]:
-                    molecules.extend(
-                        self.profiler.flavor_loader.molecules_by_source.get(base.lower(), [])
-                    )
+    def _profile(self, ingredient: str) -> Dict:
+        """Return the (cached) molecular profile for a candidate ingredient."""
+        key = _canon(ingredient)
+        if key not in self._profile_cache:
+            self._profile_cache[key] = self.profiler.get_ingredient_profile(ingredient)
+        return self._profile_cache[key]
 
-            return molecules
+    def _candidate_table(self, names: tuple) -> tuple:
+        """
+        Packed profiles for a tuple of candidate ingredients, built once.
 
-        # Monkey patch (not ideal but works for proof-of-concept)
-        self.profiler.flavor_loader._fuzzy_match_ingredient = enhanced_fuzzy_match
+        Returns:
+            (names, profiles, scores, has_data) where scores is an
+            (n_candidates, len(TASTE_DIMS)) array and has_data flags
+            candidates with molecular data
+        """
+        table = self._candidate_tables.get(names)
+        if table is None:
+            profiles = [self._profile(name) for name in names]
+            scores = np.array(
+                [[p['taste_scores'][dim] for dim in TASTE_DIMS] for p in profiles],
+                dtype=np.float64,
+            ).reshape(len(names), len(TASTE_DIMS))
+            has_data = np.array([p['num_molecules'] > 0 for p in profiles], dtype=bool)
+            table = (names, profiles, scores, has_data)
+            self._candidate_tables[names] = table
+        return table
 
     def _calculate_adaptive_amount(self, current_balance: float,
                                    imbalance_magnitude: float,
@@ -108,16 +265,8 @@ class FlavorOptimizerV2:
         base_percentage = 0.12  # 12% of total volume
 
         # Balance factor - reduce for already-balanced cocktails
-        if current_balance >= 0.98:
-            balance_factor = 0.0  # Don't recommend anything
-        elif current_balance >= 0.95:
-            balance_factor = 0.25  # Very small adjustments only
-        elif current_balance >= 0.90:
-            balance_factor = 0.5  # Moderate adjustments
-        elif current_balance >= 0.80:
-            balance_factor = 0.75  # Larger adjustments
-        else:
-            balance_factor = 1.0  # Full adjustments
+        # (bisect_right keeps the >= thresholds: 0.98 -> factor 0.0)
+        balance_factor = _BAL_FACTORS[bisect.bisect_right(_BAL_EDGES, current_balance)]
 
         # Severity factor - increase for severe imbalances
         severity_factor = min(imbalance_magnitude / 0.3, 2.0)
@@ -128,37 +277,71 @@ class FlavorOptimizerV2:
         # Bounds: 5ml minimum, 30ml maximum
         return round(max(5.0, min(amount, 30.0)), 1)
 
+    def _adaptive_amounts(self, balances, magnitudes, volumes) -> np.ndarray:
+        """
+        Vectorized _calculate_adaptive_amount for the batch API; arguments
+        broadcast against each other.
+
+        Args:
+            balances: Overall balance score(s) (0-1)
+            magnitudes: Imbalance magnitude(s) (distance from mean)
+            volumes: Total cocktail volume(s) in ml
+
+        Returns:
+            Recommended amounts in ml, bounded but not yet rounded (round
+            each with round(amount, 1) to match _calculate_adaptive_amount)
+        """
+        # Base amount as percentage of total volume
+        base_percentage = 0.12  # 12% of total volume
+
+        # Balance factor - reduce for already-balanced cocktails
+        balance_factor = _BAL_FACTORS_ARR[np.searchsorted(_BAL_EDGES_ARR, balances, side='right')]
+
+        # Severity factor - increase for severe imbalances
+        severity_factor = np.minimum(np.asarray(magnitudes) / 0.3, 2.0)
+
+        # Calculate final amount
+        amount = np.asarray(volumes) * base_percentage * balance_factor * severity_factor
+
+        # Bounds: 5ml minimum, 30ml maximum
+        return np.clip(amount, 5.0, 30.0)
+
     def should_recommend_changes(self, balance_score: float,
-                                taste_scores: Dict) -> tuple[bool, str]:
+                                taste_scores: Dict,
+                                mean_score: Optional[float] = None) -> tuple[bool, str]:
         """
         Determine if cocktail actually needs changes.
 
         Args:
             balance_score: Overall balance score
             taste_scores: Individual dimension scores
+            mean_score: Mean of taste_scores, if the caller already has it
 
         Returns:
             (should_recommend, message)
         """
+        # Needs work
+        if balance_score < 0.85:
+            return True, "Cocktail has imbalances that could be improved"
+
+        # Good cocktails - suggest refinements
+        if balance_score < 0.95:
+            return True, "Good cocktail with room for refinement"
+
         # Excellent cocktails - no changes
         if balance_score >= 0.98:
             return False, "Cocktail is already excellently balanced! No changes recommended."
 
-        # Very good cocktails - only if clear issue
-        if balance_score >= 0.95:
-            # Check if any dimension is VERY far off
-            mean = np.mean(list(taste_scores.values()))
-            max_deviation = max(abs(score - mean) for score in taste_scores.values())
+        # Very good cocktails - only if any dimension is VERY far off
+        scores = _scores_array(taste_scores)
+        if mean_score is None:
+            mean_score = scores.mean()
+        max_deviation = np.abs(scores - mean_score).max()
 
-            if max_deviation < 0.25:
-                return False, "Cocktail is very well balanced. Only minor refinements possible."
+        if max_deviation < 0.25:
+            return False, "Cocktail is very well balanced. Only minor refinements possible."
 
-        # Good cocktails - suggest refinements
-        if balance_score >= 0.85:
-            return True, "Good cocktail with room for refinement"
-
-        # Needs work
-        return True, "Cocktail has imbalances that could be improved"
+        return True, "Good cocktail with room for refinement"
 
     def recommend_improvements(self, cocktail_name: str,
                               target_balance: Optional[str] = None) -> Dict:
@@ -182,8 +365,14 @@ class FlavorOptimizerV2:
         current_balance = analysis['overall_balance']
         total_volume = analysis['aggregated_profile'].get('total_volume', 100.0)
 
+        # Score statistics are shared by the threshold check, imbalance
+        # detection and magnitudes
+        mean_score, std_score = _mean_std(list(current_scores.values()))
+
         # SMART THRESHOLD CHECK
-        should_rec, message = self.should_recommend_changes(current_balance, current_scores)
+        should_rec, message = self.should_recommend_changes(
+            current_balance, current_scores, mean_score
+        )
 
         if not should_rec:
             return {
@@ -196,32 +385,125 @@ class FlavorOptimizerV2:
             }
 
         # Identify imbalances
-        imbalances = self._identify_imbalances(current_scores, target_balance)
+        imbalances = self._identify_imbalances(
+            current_scores, target_balance, mean_score, std_score
+        )
+
+        # ADAPTIVE AMOUNTS, one per imbalance
+        adaptive_amounts = [
+            self._calculate_adaptive_amount(
+                current_balance,
+                abs(current_scores[imb['dimension']] - mean_score),
+                total_volume
+            )
+            for imb in imbalances
+        ]
+
+        return self._assemble_recommendations(
+            cocktail_name, analysis, imbalances, adaptive_amounts
+        )
+
+    def recommend_improvements_batch(self, cocktail_names: List[str],
+                                     target_balance: Optional[str] = None) -> List[Dict]:
+        """
+        Recommend improvements for several cocktails at once.
+
+        Same results as calling recommend_improvements per cocktail, but the
+        imbalance statistics and adaptive amounts for all cocktails are
+        computed with a handful of array operations.
+
+        Args:
+            cocktail_names: Names of cocktails
+            target_balance: Optional target applied to every cocktail
+
+        Returns:
+            One recommendations dict per cocktail, in input order
+        """
+        results: List[Optional[Dict]] = [None] * len(cocktail_names)
+        pending = []  # (result index, analysis) for cocktails that need changes
+
+        for i, cocktail_name in enumerate(cocktail_names):
+            analysis = self.analyzer.analyze_cocktail(cocktail_name)
 
-        # Generate recommendations with ADAPTIVE AMOUNTS
+            if 'error' in analysis:
+                results[i] = analysis
+                continue
+
+            should_rec, message = self.should_recommend_changes(
+                analysis['overall_balance'], analysis['balance_scores']
+            )
+
+            if not should_rec:
+                results[i] = {
+                    'cocktail': cocktail_name,
+                    'current_balance': analysis['balance_scores'],
+                    'overall_balance_score': analysis['overall_balance'],
+                    'message': message,
+                    'identified_issues': [],
+                    'recommendations': []
+                }
+                continue
+
+            pending.append((i, analysis))
+
+        if not pending:
+            return results
+
+        # (C, n_dims) score matrix in the analyzer's dimension order
+        dims = tuple(pending[0][1]['balance_scores'])
+        scores = np.array([[a['balance_scores'][d] for d in dims] for _, a in pending])
+        balances = np.array([a['overall_balance'] for _, a in pending])
+        volumes = np.array([a['aggregated_profile'].get('total_volume', 100.0) for _, a in pending])
+
+        means = scores.mean(axis=1)
+        stds = scores.std(axis=1)
+        too_high = scores > (means + stds * _IMBALANCE_STD_FACTOR)[:, None]
+        too_low = (scores < (means - stds * _IMBALANCE_STD_FACTOR)[:, None]) & (scores < _TOO_LOW_MAX)
+
+        # Flatten every (cocktail, imbalance) pair, target imbalances first
+        imbalances_per_row = [self._target_imbalances(target_balance) for _ in pending]
+        for row, col in np.argwhere(too_high | too_low):
+            dimension = dims[col]
+            imbalances_per_row[row].append(_auto_imbalance(
+                dimension,
+                'too_high' if too_high[row, col] else 'too_low',
+                pending[row][1]['balance_scores'][dimension],
+            ))
+
+        rows = [row for row, imbalances in enumerate(imbalances_per_row) for _ in imbalances]
+        cols = [dims.index(imb['dimension']) for imbalances in imbalances_per_row for imb in imbalances]
+        mags = np.abs(scores[rows, cols] - means[rows])
+        amounts = [round(amount, 1)
+                   for amount in self._adaptive_amounts(balances[rows], mags, volumes[rows]).tolist()]
+
+        # Assemble per-cocktail results
+        offset = 0
+        for (i, analysis), imbalances in zip(pending, imbalances_per_row):
+            n = len(imbalances)
+            results[i] = self._assemble_recommendations(
+                cocktail_names[i], analysis, imbalances, amounts[offset:offset + n]
+            )
+            offset += n
+
+        return results
+
+    def _assemble_recommendations(self, cocktail_name: str, analysis: Dict,
+                                  imbalances: List[Dict],
+                                  adaptive_amounts: List[float]) -> Dict:
+        """Build the recommendations result from imbalances and their amounts."""
+        current_scores = analysis['balance_scores']
         recommendations = []
 
-        for imbalance in imbalances:
+        for imbalance, adaptive_amount in zip(imbalances, adaptive_amounts):
             dimension = imbalance['dimension']
             issue_type = imbalance['type']
 
-            # Calculate imbalance magnitude
-            mean = np.mean(list(current_scores.values()))
-            imbalance_mag = abs(current_scores[dimension] - mean)
-
             # Find corrective ingredients
             suggestions = self._find_corrective_ingredients(
                 dimension, issue_type, current_scores, analysis['ingredients']
             )
 
-            for suggestion in suggestions[:3]:
-                # ADAPTIVE AMOUNT
-                adaptive_amount = self._calculate_adaptive_amount(
-                    current_balance,
-                    imbalance_mag,
-                    total_volume
-                )
-
+            for suggestion in islice(suggestions, 3):
                 suggestion['amount'] = adaptive_amount
                 suggestion['reason'] = f"Add {suggestion['ingredient']} ({adaptive_amount}ml) to {'increase' if issue_type == 'too_low' else 'balance'} {dimension}"
 
@@ -233,108 +515,89 @@ class FlavorOptimizerV2:
         return {
             'cocktail': cocktail_name,
             'current_balance': current_scores,
-            'overall_balance_score': current_balance,
+            'overall_balance_score': analysis['overall_balance'],
             'identified_issues': imbalances,
             'recommendations': recommendations,
         }
 
-    def _identify_imbalances(self, taste_scores: Dict, target: Optional[str] = None) -> List[Dict]:
+    def _identify_imbalances(self, taste_scores: Dict, target: Optional[str] = None,
+                             mean_score: Optional[float] = None,
+                             std_score: Optional[float] = None) -> List[Dict]:
         """
         Identify flavor imbalances (same as V1).
-        """
-        imbalances = []
-
-        if target:
-            target_map = {
-                'sweeter': ('sweet', 'increase'),
-                'more_sour': ('sour', 'increase'),
-                'less_bitter': ('bitter', 'decrease'),
-                'more_aromatic': ('aromatic', 'increase'),
-                'balanced': None,
-            }
 
-            if target in target_map and target_map[target]:
-                dimension, direction = target_map[target]
-                imbalances.append({
-                    'dimension': dimension,
-                    'type': 'too_low' if direction == 'increase' else 'too_high',
-                    'priority': 'high',
-                })
+        mean_score/std_score may be passed in when the caller already has them.
+        """
+        imbalances = self._target_imbalances(target)
 
         # Auto-detect imbalances
-        mean_score = np.mean(list(taste_scores.values()))
-        std_score = np.std(list(taste_scores.values()))
+        if mean_score is None or std_score is None:
+            scores = _scores_array(taste_scores)
+            mean_score, std_score = scores.mean(), scores.std()
 
         for dimension, score in taste_scores.items():
-            if score > mean_score + std_score * 0.7:  # Stricter threshold
-                imbalances.append({
-                    'dimension': dimension,
-                    'type': 'too_high',
-                    'priority': 'medium',
-                    'current_value': score,
-                })
-            elif score < mean_score - std_score * 0.7 and score < 0.3:
-                imbalances.append({
-                    'dimension': dimension,
-                    'type': 'too_low',
-                    'priority': 'medium',
-                    'current_value': score,
-                })
+            if score > mean_score + std_score * _IMBALANCE_STD_FACTOR:
+                imbalances.append(_auto_imbalance(dimension, 'too_high', score))
+            elif score < mean_score - std_score * _IMBALANCE_STD_FACTOR and score < _TOO_LOW_MAX:
+                imbalances.append(_auto_imbalance(dimension, 'too_low', score))
 
         return imbalances
 
+    def _target_imbalances(self, target: Optional[str]) -> List[Dict]:
+        """Imbalance implied by an explicit user target, if any."""
+        if not target:
+            return []
+
+        target_map = {
+            'sweeter': ('sweet', 'increase'),
+            'more_sour': ('sour', 'increase'),
+            'less_bitter': ('bitter', 'decrease'),
+            'more_aromatic': ('aromatic', 'increase'),
+            'balanced': None,
+        }
+
+        if target in target_map and target_map[target]:
+            dimension, direction = target_map[target]
+            return [{
+                'dimension': dimension,
+                'type': 'too_low' if direction == 'increase' else 'too_high',
+                'priority': 'high',
+            }]
+
+        return []
+
     def _find_corrective_ingredients(self, dimension: str, issue_type: str,
-                                    current_scores: Dict, existing_ingredients: List[str]) -> List[Dict]:
+                                    current_scores: Dict, existing_ingredients: List[str]) -> Iterator[Dict]:
         """
         Find ingredients to correct imbalance (same as V1).
+
+        Yields up to 5 suggestions, most relevant first. The 'amount' key is
+        filled in later with the adaptive amount.
         """
-        suggestions = []
-
-        # Ingredient categories by dimension
-        dimension_ingredients = {
-            'sweet': ['simple syrup', 'honey', 'agave syrup', 'sugar'],
-            'sour': ['lemon juice', 'lime juice', 'grapefruit juice'],
-            'bitter': ['angostura bitters', 'campari', 'coffee'],
-            'aromatic': ['mint', 'basil', 'bitters'],
-            'savory': ['celery', 'tomato juice'],
-        }
+        existing = frozenset(map(_canon, existing_ingredients))
 
+        # Too high: add the contrasting flavor
+        candidates = _TOO_LOW[dimension] if issue_type == 'too_low' else _TOO_HIGH[dimension]
+        names, profiles, scores, has_data = self._candidate_table(candidates)
+
+        # Filter: skip ingredients already present or without molecular data
+        not_present = np.fromiter((_canon(name) not in existing for name in names),
+                                  dtype=bool, count=len(names))
+        keep = np.flatnonzero(has_data & not_present)
+
+        # Sort by relevance (stable, so ties keep candidate order) and keep top 5
+        relevance = scores[keep, TASTE_DIMS.index(dimension)]
         if issue_type == 'too_low':
-            candidate_ingredients = dimension_ingredients.get(dimension, [])
-        else:
-            # Add contrasting flavor
-            contrasting = {
-                'sweet': 'sour',
-                'sour': 'sweet',
-                'bitter': 'sweet',
-                'aromatic': 'sweet',
-                'savory': 'sweet',
+            relevance = -relevance
+        top = keep[np.argsort(relevance, kind='stable')[:5]]
+
+        for i in top:
+            yield {
+                'action': 'add',
+                'ingredient': names[i],
+                'predicted_impact': {dimension: _PREDICTED_IMPACT_STR},
+                'ingredient_taste_profile': profiles[i]['taste_scores'],
             }
-            contrast_dim = contrasting.get(dimension, 'sweet')
-            candidate_ingredients = dimension_ingredients.get(contrast_dim, [])
-
-        # Filter and score
-        for ingredient in candidate_ingredients:
-            if ingredient.lower() not in [e.lower() for e in existing_ingredients]:
-                profile = self.profiler.get_ingredient_profile(ingredient)
-
-                if profile['num_molecules'] > 0:
-                    suggestion = {
-                        'action': 'add',
-                        'ingredient': ingredient,
-                        'amount': 15.0,  # Will be overridden by adaptive amount
-                        'predicted_impact': {dimension: f"+0.15"},
-                        'ingredient_taste_profile': profile['taste_scores'],
-                    }
-                    suggestions.append(suggestion)
-
-        # Sort by relevance
-        suggestions.sort(
-            key=lambda x: x['ingredient_taste_profile'][dimension],
-            reverse=(issue_type == 'too_low')
-        )
-
-        return suggestions[:5]
 
 
 def main():
@@ -355,9 +618,10 @@ def main():
     print("\nTesting threshold logic and adaptive amounts...")
     print("-"*70)
 
-    for cocktail, expected_balance in test_cocktails:
+    all_recs = optimizer.recommend_improvements_batch([name for name, _ in test_cocktails])
+
+    for (cocktail, expected_balance), recs in zip(test_cocktails, all_recs):
         print(f"\n{cocktail.upper()}:")
-        recs = optimizer.recommend_improvements(cocktail)
 
         if 'error' in recs:
             print(f"  Error: {recs['error']}")
@@ -9,13 +9,25 @@ New in V3:
 - Combination recommendations (add multiple ingredients)
 """
 
+import bisect
+import copy
+import functools
+import heapq
 import json
+import sys
+from itertools import chain, islice
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple
 import numpy as np
-from collections import defaultdict
+
+try:
+    import orjson  # Optional: faster JSON parsing
+except ImportError:
+    orjson = None
 
 from ..analysis.molecular_profile import MolecularProfiler, CocktailAnalyzer
+from ..data.flavor_loader import FlavorLoader
 from ..recommendation.optimizer import CocktailModifier
 
 
@@ -104,6 +116,123 @@ SPIRIT_FALLBACK_MAPPINGS = {
     'sherry': ['grape', 'oak'],
 }
 
+# Lookup form of SPIRIT_FALLBACK_MAPPINGS: lowercase keys and bases
+SPIRIT_FALLBACK_MAPPINGS_LOWER = {
+    spirit.lower(): tuple(base.lower() for base in bases)
+    for spirit, bases in SPIRIT_FALLBACK_MAPPINGS.items()
+}
+
+
+# Fixed order of taste dimensions in packed score vectors
+TASTE_DIMS = ('sweet', 'sour', 'bitter', 'aromatic', 'savory')
+
+
+def _scores_to_vec(scores: Dict[str, float]) -> np.ndarray:
+    """Pack a taste-score dict into a vector ordered by TASTE_DIMS."""
+    return np.array([scores[dim] for dim in TASTE_DIMS], dtype=np.float64)
+
+
+def _build_spirit_trie(names) -> Dict:
+    """Token trie over spirit names; a None key marks the end of a name."""
+    root = {}
+    for name in names:
+        node = root
+        for token in name.split():
+            node = node.setdefault(token, {})
+        node[None] = name
+    return root
+
+
+_SPIRIT_TRIE = _build_spirit_trie(SPIRIT_FALLBACK_MAPPINGS_LOWER)
+
+
+def _longest_spirit_match(ingredient: str) -> Optional[str]:
+    """
+    Find the longest spirit name contained in an ingredient string.
+
+    Matches whole tokens, so '2 oz white rum' -> 'white rum' and
+    'spiced dark rum' -> 'dark rum'.
+
+    Args:
+        ingredient: Ingredient name, any case
+
+    Returns:
+        Key of SPIRIT_FALLBACK_MAPPINGS_LOWER, or None
+    """
+    tokens = ingredient.lower().split()
+    best, best_len = None, 0
+
+    for start in range(len(tokens)):
+        node = _SPIRIT_TRIE
+        for end in range(start, len(tokens)):
+            node = node.get(tokens[end])
+            if node is None:
+                break
+            if None in node and end - start + 1 > best_len:
+                best, best_len = node[None], end - start + 1
+
+    return best
+
+
+# Corrective ingredient candidates by taste dimension (read-only)
+DIMENSION_INGREDIENTS = MappingProxyType({
+    'sweet': ('simple syrup', 'honey', 'agave syrup', 'sugar', 'maple syrup'),
+    'sour': ('lemon juice', 'lime juice', 'grapefruit juice'),
+    'bitter': ('angostura bitters', 'campari', 'aperol', 'coffee'),
+    'aromatic': ('mint', 'basil', 'bitters', 'orange bitters'),
+    'savory': ('celery', 'tomato juice'),
+})
+
+# Dimension whose ingredients offset a dimension that is too high
+_CONTRASTING = MappingProxyType({
+    'sweet': 'sour',
+    'sour': 'sweet',
+    'bitter': 'sweet',
+    'aromatic': 'sweet',
+    'savory': 'sweet',
+})
+
+# Candidates keyed by (dimension, issue_type)
+_CORRECTIVE_CANDIDATES = MappingProxyType({
+    **{(dim, 'too_low'): ings for dim, ings in DIMENSION_INGREDIENTS.items()},
+    **{(dim, 'too_high'): DIMENSION_INGREDIENTS[_CONTRASTING[dim]] for dim in DIMENSION_INGREDIENTS},
+})
+
+# Adaptive amount balance factors: <0.80 -> 1.0, ..., >=0.98 -> 0.0
+_BAL_BINS = (0.80, 0.90, 0.95, 0.98)
+_BAL_FACTORS = (1.0, 0.75, 0.5, 0.25, 0.0)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_ingredients(path: str) -> tuple:
+    """Parse the ingredient list once per process (empty if missing)."""
+    try:
+        data = Path(path).read_bytes()
+    except FileNotFoundError:
+        return ()
+    return tuple(orjson.loads(data) if orjson else json.loads(data))
+
+
+class _FuzzyMatcher:
+    """FlavorLoader fuzzy matcher extended with spirit fallback mappings."""
+
+    __slots__ = ('orig', 'mols')
+
+    def __init__(self, orig, mols: Dict[str, List[Dict]]):
+        self.orig = orig  # Original FlavorLoader._fuzzy_match_ingredient
+        self.mols = mols  # Spirit -> concatenated base molecules
+
+    def __call__(self, ingredient: str) -> List[Dict]:
+        molecules = self.orig(ingredient)
+
+        if not molecules:
+            # Longest spirit name in the ingredient, e.g. '2 oz white rum'
+            spirit = _longest_spirit_match(ingredient)
+            if spirit:
+                molecules.extend(self.mols[spirit])
+
+        return molecules
+
 
 class FlavorOptimizerV3:
     """
@@ -111,38 +240,75 @@ class FlavorOptimizerV3:
     """
 
     def __init__(self, data_dir: str = "raw"):
-        """Initialize V3 optimizer."""
-        self.profiler = MolecularProfiler(data_dir)
-        self.analyzer = CocktailAnalyzer(data_dir)
-        self.modifier = CocktailModifier(data_dir)
-
-        # Enhance with expanded mappings
-        self._enhance_ingredient_mappings()
-
-        # Load ingredients
-        ingredient_file = Path("data/processed/ingredients_list.json")
-        if ingredient_file.exists():
-            with open(ingredient_file, 'r', encoding='utf-8') as f:
-                self.available_ingredients = json.load(f)
-        else:
-            self.available_ingredients = []
+        """
+        Initialize V3 optimizer.
 
-    def _enhance_ingredient_mappings(self):
-        """Add expanded fallback mappings."""
-        original_fuzzy = self.profiler.flavor_loader._fuzzy_match_ingredient
+        The profiler, analyzer and modifier are built on first use and share
+        a single parsed FlavorDB.
+        """
+        self.data_dir = data_dir
 
-        def enhanced_fuzzy_match(ingredient: str):
-            molecules = original_fuzzy(ingredient)
+        # Memoized lookups: candidate profiles repeat across calls, and
+        # find_best_modification/recommend_improvements analyze the same cocktail
+        self._profile_cache = functools.lru_cache(maxsize=2048)(self._vectorized_profile)
+        self._analyze = functools.lru_cache(maxsize=256)(self._analyze_uncached)
 
-            if not molecules and ingredient.lower() in SPIRIT_FALLBACK_MAPPINGS:
-                for base in SPIRIT_FALLBACK_MAPPINGS[ingredient.lower()]:
-                    molecules.extend(
-                        self.profiler.flavor_loader.molecules_by_source.get(base.lower(), [])
-                    )
+        # Load ingredients
+        self.available_ingredients = _load_ingredients("data/processed/ingredients_list.json")
+
+    @functools.cached_property
+    def _flavor_loader(self) -> FlavorLoader:
+        """FlavorDB, parsed once and shared by all components."""
+        flavor_loader = FlavorLoader(self.data_dir)
+        flavor_loader.load_flavor_db()
+        return flavor_loader
+
+    @functools.cached_property
+    def _base_profiler(self) -> MolecularProfiler:
+        """Profiler without the expanded mappings, used for analysis."""
+        return MolecularProfiler(self.data_dir, flavor_loader=self._flavor_loader)
+
+    @functools.cached_property
+    def profiler(self) -> MolecularProfiler:
+        """Profiler with expanded mappings, used to profile candidates."""
+        # Shallow copy: shares the parsed molecules, but the fuzzy-match
+        # patch below must not leak into the analyzer's loader
+        profiler = MolecularProfiler(self.data_dir, flavor_loader=copy.copy(self._flavor_loader))
+        self._enhance_ingredient_mappings(profiler)
+        return profiler
+
+    @functools.cached_property
+    def analyzer(self) -> CocktailAnalyzer:
+        return CocktailAnalyzer(self.data_dir, profiler=self._base_profiler)
+
+    @functools.cached_property
+    def modifier(self) -> CocktailModifier:
+        return CocktailModifier(self.data_dir, profiler=self._base_profiler, analyzer=self.analyzer)
+
+    def _analyze_uncached(self, cocktail_name: str) -> Dict:
+        return self.analyzer.analyze_cocktail(cocktail_name)
+
+    def _enhance_ingredient_mappings(self, profiler: MolecularProfiler):
+        """Add expanded fallback mappings to a profiler's flavor loader."""
+        original_fuzzy = profiler.flavor_loader._fuzzy_match_ingredient
+        molecules_by_source = profiler.flavor_loader.molecules_by_source
+
+        # Concatenated base molecules per spirit, built once
+        spirit_molecules = {
+            spirit: list(chain.from_iterable(molecules_by_source.get(base, ()) for base in bases))
+            for spirit, bases in SPIRIT_FALLBACK_MAPPINGS_LOWER.items()
+        }
 
-            return molecules
+        # Memoized: most cocktails share common ingredients
+        profiler.flavor_loader._fuzzy_match_ingredient = functools.lru_cache(maxsize=4096)(
+            _FuzzyMatcher(original_fuzzy, spirit_molecules)
+        )
 
-        self.profiler.flavor_loader._fuzzy_match_ingredient = enhanced_fuzzy_match
+    def _vectorized_profile(self, ingredient: str) -> Dict:
+        """Ingredient profile with its taste scores also packed as 'taste_vec'."""
+        profile = self.profiler.get_ingredient_profile(ingredient)
+        # Shallow copy: the profiler's cached (JSON-serializable) profile stays untouched
+        return {**profile, 'taste_vec': _scores_to_vec(profile['taste_scores'])}
 
     def find_best_modification(self, cocktail_name: str, max_candidates: int = 5) -> Dict:
         """
@@ -156,13 +322,22 @@ class FlavorOptimizerV3:
             Best modification with predicted improvement
         """
         # Get original state
-        original = self.analyzer.analyze_cocktail(cocktail_name)
+        original = self._analyze(cocktail_name)
         if 'error' in original:
             return original
 
         original_balance = original['overall_balance']
         original_scores = original['balance_scores']
 
+        # Nothing to test for cocktails that need no changes
+        should_rec, message = self._should_recommend_changes(original_balance, original_scores)
+        if not should_rec:
+            return {
+                'cocktail': cocktail_name,
+                'best_modification': None,
+                'message': message
+            }
+
         # Get all recommendations
         all_recs = self.recommend_improvements(cocktail_name)
 
@@ -173,36 +348,36 @@ class FlavorOptimizerV3:
                 'message': all_recs.get('message', 'No recommendations available')
             }
 
-        # Test each recommendation
+        # Test each recommendation (all candidates scored in one pass)
+        recs = all_recs['recommendations'][:max_candidates]
+        new_balances = self._candidate_balances(cocktail_name, original, recs)
+
+        # Drop candidates modify_cocktail could not score (NaN); ranks keep
+        # the recommendation order
+        tested = np.flatnonzero(~np.isnan(new_balances))
+        improvements = new_balances[tested] - original_balance
+
         candidates = []
 
-        for i, rec in enumerate(all_recs['recommendations'][:max_candidates]):
+        for i, new_balance, improvement in zip(
+                tested.tolist(), new_balances[tested].tolist(), improvements.tolist()):
+            rec = recs[i]
             modification = [{
                 'action': 'add',
                 'ingredient': rec['recommendation']['ingredient'],
                 'amount': rec['recommendation']['amount']
             }]
 
-            try:
-                result = self.modifier.modify_cocktail(cocktail_name, modification)
-
-                if 'error' not in result:
-                    new_balance = result['modified']['overall_balance']
-                    improvement = new_balance - original_balance
-
-                    candidates.append({
-                        'rank': i + 1,
-                        'modification': modification,
-                        'ingredient': rec['recommendation']['ingredient'],
-                        'amount': rec['recommendation']['amount'],
-                        'original_balance': original_balance,
-                        'new_balance': new_balance,
-                        'improvement': improvement,
-                        'reason': rec['recommendation']['reason']
-                    })
-
-            except Exception as e:
-                continue
+            candidates.append({
+                'rank': i + 1,
+                'modification': modification,
+                'ingredient': rec['recommendation']['ingredient'],
+                'amount': rec['recommendation']['amount'],
+                'original_balance': original_balance,
+                'new_balance': new_balance,
+                'improvement': improvement,
+                'reason': rec['recommendation']['reason']
+            })
 
         if not candidates:
             return {
@@ -212,7 +387,7 @@ class FlavorOptimizerV3:
             }
 
         # Find BEST candidate (highest improvement)
-        best = max(candidates, key=lambda x: x['improvement'])
+        best = candidates[int(np.argmax(improvements))]
 
         return {
             'cocktail': cocktail_name,
@@ -222,12 +397,62 @@ class FlavorOptimizerV3:
             'tested_count': len(candidates)
         }
 
+    def _candidate_balances(self, cocktail_name: str, original: Dict,
+                            recs: List[Dict]) -> np.ndarray:
+        """
+        Predict the overall balance after each recommended addition.
+
+        Computed as a volume-weighted update of the base taste scores,
+        new[d] = (base[d] * V + added[d] * A) / (V + A), for all candidates
+        at once. Matches CocktailModifier.modify_cocktail with a single 'add'
+        wherever that succeeds; candidates it cannot score (zero base volume
+        plus an ingredient without molecular data) come back as NaN.
+
+        Args:
+            cocktail_name: Base cocktail
+            original: analyze_cocktail() result for the base cocktail
+            recs: Recommendations from recommend_improvements
+
+        Returns:
+            Predicted overall balance per recommendation (NaN if untestable)
+        """
+        base_scores = _scores_to_vec(original['balance_scores'])
+
+        # Raw measure volume (the aggregator's weights; may be 0)
+        measures = self.analyzer._find_cocktail(cocktail_name)['measures']
+        base_volume = sum(m.get('value', 30.0) for m in measures)
+
+        # Added ingredients are profiled the way modify_cocktail profiles them
+        amounts = np.array([rec['recommendation']['amount'] for rec in recs], dtype=np.float64)
+        added_profiles = [
+            self.modifier.profiler.get_ingredient_profile(rec['recommendation']['ingredient'])
+            for rec in recs
+        ]
+        added_scores = np.array([
+            _scores_to_vec(profile['taste_scores']) for profile in added_profiles
+        ], dtype=np.float64).reshape(len(recs), len(TASTE_DIMS))
+
+        new_scores = (base_scores * base_volume + added_scores * amounts[:, None]) \
+            / (base_volume + amounts)[:, None]
+
+        # CocktailAnalyzer._compute_overall_balance, row-wise
+        balances = 1.0 / (1.0 + new_scores.var(axis=1))
+        balances = np.where((new_scores == 0).all(axis=1), 0.0, balances)
+
+        # With no base volume only the addition carries weight; modify_cocktail
+        # raises (zero weights) when it has no molecular data either
+        if base_volume == 0:
+            no_data = np.array([profile['num_molecules'] == 0 for profile in added_profiles], dtype=bool)
+            balances[no_data] = np.nan
+
+        return balances
+
     def recommend_improvements(self, cocktail_name: str,
                               target_balance: Optional[str] = None) -> Dict:
         """
         Generate recommendations (same as V2 but with expanded mappings).
         """
-        analysis = self.analyzer.analyze_cocktail(cocktail_name)
+        analysis = self._analyze(cocktail_name)
 
         if 'error' in analysis:
             return analysis
@@ -252,6 +477,11 @@ class FlavorOptimizerV3:
         # Identify imbalances
         imbalances = self._identify_imbalances(current_scores, target_balance)
 
+        # Loop invariants
+        scores_arr = np.fromiter(current_scores.values(), dtype=np.float64, count=len(current_scores))
+        mean_score = scores_arr.mean()
+        ingredients = analysis['ingredients']
+
         # Generate recommendations
         recommendations = []
 
@@ -259,20 +489,20 @@ class FlavorOptimizerV3:
             dimension = imbalance['dimension']
             issue_type = imbalance['type']
 
-            mean = np.mean(list(current_scores.values()))
-            imbalance_mag = abs(current_scores[dimension] - mean)
+            imbalance_mag = abs(current_scores[dimension] - mean_score)
 
             suggestions = self._find_corrective_ingredients(
-                dimension, issue_type, current_scores, analysis['ingredients']
+                dimension, issue_type, current_scores, ingredients
             )
 
-            for suggestion in suggestions[:5]:  # Top 5 per issue
-                adaptive_amount = self._calculate_adaptive_amount(
-                    current_balance,
-                    imbalance_mag,
-                    total_volume
-                )
+            # Same amount for every suggestion addressing this issue
+            adaptive_amount = self._calculate_adaptive_amount(
+                current_balance,
+                imbalance_mag,
+                total_volume
+            )
 
+            for suggestion in islice(suggestions, 5):  # Top 5 per issue
                 suggestion['amount'] = adaptive_amount
                 suggestion['reason'] = f"Add {suggestion['ingredient']} ({adaptive_amount}ml) to {'increase' if issue_type == 'too_low' else 'balance'} {dimension}"
 
@@ -295,31 +525,24 @@ class FlavorOptimizerV3:
         """Calculate adaptive amount (same as V2)."""
         base_percentage = 0.12
 
-        if current_balance >= 0.98:
-            balance_factor = 0.0
-        elif current_balance >= 0.95:
-            balance_factor = 0.25
-        elif current_balance >= 0.90:
-            balance_factor = 0.5
-        elif current_balance >= 0.80:
-            balance_factor = 0.75
-        else:
-            balance_factor = 1.0
+        # bisect_right keeps the >= thresholds: 0.98 -> factor 0.0
+        balance_factor = _BAL_FACTORS[bisect.bisect_right(_BAL_BINS, current_balance)]
 
         severity_factor = min(imbalance_magnitude / 0.3, 2.0)
         amount = total_volume * base_percentage * balance_factor * severity_factor
 
         return round(max(5.0, min(amount, 30.0)), 1)
 
-    def _should_recommend_changes(self, balance_score: float,
+    @staticmethod
+    def _should_recommend_changes(balance_score: float,
                                   taste_scores: Dict) -> Tuple[bool, str]:
         """Check if changes needed (same as V2)."""
         if balance_score >= 0.98:
             return False, "Cocktail is already excellently balanced! No changes recommended."
 
         if balance_score >= 0.95:
-            mean = np.mean(list(taste_scores.values()))
-            max_deviation = max(abs(score - mean) for score in taste_scores.values())
+            scores = np.fromiter(taste_scores.values(), dtype=np.float64, count=len(taste_scores))
+            max_deviation = np.abs(scores - scores.mean()).max()
 
             if max_deviation < 0.25:
                 return False, "Cocktail is very well balanced. Only minor refinements possible."
@@ -350,56 +573,38 @@ class FlavorOptimizerV3:
                     'priority': 'high',
                 })
 
-        mean_score = np.mean(list(taste_scores.values()))
-        std_score = np.std(list(taste_scores.values()))
+        dims = tuple(taste_scores)
+        scores = np.fromiter(taste_scores.values(), dtype=np.float64, count=len(taste_scores))
+        mean_score = scores.mean()
+        std_score = scores.std()
 
-        for dimension, score in taste_scores.items():
-            if score > mean_score + std_score * 0.7:
-                imbalances.append({
-                    'dimension': dimension,
-                    'type': 'too_high',
-                    'priority': 'medium',
-                    'current_value': score,
-                })
-            elif score < mean_score - std_score * 0.7 and score < 0.3:
-                imbalances.append({
-                    'dimension': dimension,
-                    'type': 'too_low',
-                    'priority': 'medium',
-                    'current_value': score,
-                })
+        too_high = scores > mean_score + std_score * 0.7
+        too_low = ~too_high & (scores < mean_score - std_score * 0.7) & (scores < 0.3)
+
+        for i in np.flatnonzero(too_high | too_low):
+            dimension = dims[i]
+            imbalances.append({
+                'dimension': dimension,
+                'type': 'too_high' if too_high[i] else 'too_low',
+                'priority': 'medium',
+                'current_value': taste_scores[dimension],
+            })
 
         return imbalances
 
     def _find_corrective_ingredients(self, dimension: str, issue_type: str,
                                     current_scores: Dict, existing_ingredients: List[str]) -> List[Dict]:
         """Find corrective ingredients (same as V2)."""
-        suggestions = []
-
-        dimension_ingredients = {
-            'sweet': ['simple syrup', 'honey', 'agave syrup', 'sugar', 'maple syrup'],
-            'sour': ['lemon juice', 'lime juice', 'grapefruit juice'],
-            'bitter': ['angostura bitters', 'campari', 'aperol', 'coffee'],
-            'aromatic': ['mint', 'basil', 'bitters', 'orange bitters'],
-            'savory': ['celery', 'tomato juice'],
-        }
+        scored = []  # (relevance, suggestion)
+        existing_lower = frozenset(e.lower() for e in existing_ingredients)
+        dim_index = TASTE_DIMS.index(dimension)
 
-        if issue_type == 'too_low':
-            candidate_ingredients = dimension_ingredients.get(dimension, [])
-        else:
-            contrasting = {
-                'sweet': 'sour',
-                'sour': 'sweet',
-                'bitter': 'sweet',
-                'aromatic': 'sweet',
-                'savory': 'sweet',
-            }
-            contrast_dim = contrasting.get(dimension, 'sweet')
-            candidate_ingredients = dimension_ingredients.get(contrast_dim, [])
+        # Too high: candidates come from the contrasting dimension
+        candidate_ingredients = _CORRECTIVE_CANDIDATES.get((dimension, issue_type), ())
 
         for ingredient in candidate_ingredients:
-            if ingredient.lower() not in [e.lower() for e in existing_ingredients]:
-                profile = self.profiler.get_ingredient_profile(ingredient)
+            if ingredient.lower() not in existing_lower:
+                profile = self._profile_cache(ingredient)
 
                 if profile['num_molecules'] > 0:
                     suggestion = {
@@ -409,14 +614,11 @@ class FlavorOptimizerV3:
                         'predicted_impact': {dimension: f"+0.15"},
                         'ingredient_taste_profile': profile['taste_scores'],
                     }
-                    suggestions.append(suggestion)
+                    scored.append((profile['taste_vec'][dim_index], suggestion))
 
-        suggestions.sort(
-            key=lambda x: x['ingredient_taste_profile'][dimension],
-            reverse=(issue_type == 'too_low')
-        )
-
-        return suggestions[:5]
+        # Top 5 by relevance (same order as a full sort + slice)
+        select = heapq.nlargest if issue_type == 'too_low' else heapq.nsmallest
+        return [suggestion for _, suggestion in select(5, scored, key=lambda x: x[0])]
 
 
 def main():
@@ -432,33 +634,37 @@ def main():
     print("\nTesting multi-recommendation selection...")
     print("-"*70)
 
+    # Collect the report and write it once instead of per-line prints
+    buf = []
+
     for cocktail in test_cocktails:
-        print(f"\n{cocktail.upper()}:")
+        buf.append(f"\n{cocktail.upper()}:")
 
         result = optimizer.find_best_modification(cocktail, max_candidates=5)
 
         if 'error' in result or not result.get('best_modification'):
-            print(f"  {result.get('message', 'No modifications')}")
+            buf.append(f"  {result.get('message', 'No modifications')}")
             continue
 
         best = result['best_modification']
-        print(f"  Original balance: {result['original_balance']:.3f}")
-        print(f"  Tested {result['tested_count']} candidates")
-        print(f"")
-        print(f"  BEST CHOICE (rank #{best['rank']}):")
-        print(f"    {best['reason']}")
-        print(f"    Predicted improvement: {best['improvement']:+.4f}")
-        print(f"    New balance: {best['new_balance']:.3f}")
+        buf.append(f"  Original balance: {result['original_balance']:.3f}")
+        buf.append(f"  Tested {result['tested_count']} candidates")
+        buf.append("")
+        buf.append(f"  BEST CHOICE (rank #{best['rank']}):")
+        buf.append(f"    {best['reason']}")
+        buf.append(f"    Predicted improvement: {best['improvement']:+.4f}")
+        buf.append(f"    New balance: {best['new_balance']:.3f}")
 
         # Show other candidates
         if len(result['all_candidates']) > 1:
-            print(f"\n  Other options tested:")
+            buf.append(f"\n  Other options tested:")
             for cand in result['all_candidates']:
                 if cand['rank'] != best['rank']:
-                    print(f"    #{cand['rank']}: {cand['ingredient']:20s} "
-                          f"{cand['improvement']:+.4f} ({cand['amount']}ml)")
+                    buf.append(f"    #{cand['rank']}: {cand['ingredient']:20s} "
+                               f"{cand['improvement']:+.4f} ({cand['amount']}ml)")
 
-    print("\n" + "="*70)
+    buf.append("\n" + "="*70)
+    sys.stdout.write("\n".join(buf) + "\n")
 
 
 if __name__ == "__main__":
@@ -9,104 +9,312 @@ Key improvements over V3:
 4. Ingredient frequency weighting
 """
 
+import functools
 import json
+import logging
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 import sys
+import numpy as np
 
-# Add parent to path
-sys.path.append(str(Path(__file__).parent.parent.parent))
+try:
+    import orjson  # Optional: faster JSON parsing
+except ImportError:
+    orjson = None
 
-from src.recommendation.optimizer_v3 import FlavorOptimizerV3
+if TYPE_CHECKING:
+    from src.recommendation.optimizer_v3 import FlavorOptimizerV3
 
+log = logging.getLogger(__name__)
 
-class FlavorOptimizerV4(FlavorOptimizerV3):
+# Taste dimensions, in V3's order
+TASTE_DIMS = ('sweet', 'sour', 'bitter', 'aromatic', 'savory')
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_json(path_str: str, mtime: float):
+    """Parse a JSON file once per (path, mtime); callers share the result."""
+    data = Path(path_str).read_bytes()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+# Data files (relative to the project root, like the rest of the pipeline)
+_DATA = Path("data")
+_PROCESSED = _DATA / "processed"
+_BOOK_FILE = _DATA / "book_cocktails.json"
+_FREQ_FILE = _PROCESSED / "ingredient_frequency.json"
+_PLAUS_FILE = _PROCESSED / "ingredient_plausibility.json"
+_PERFECT_FILE = _PROCESSED / "perfect_cocktails.json"
+
+# Book-knowledge sources, and the pickle of everything derived from them
+_KNOWLEDGE_FILES = (_FREQ_FILE, _PLAUS_FILE, _PERFECT_FILE)
+_KNOWLEDGE_CACHE_FILE = _PROCESSED / ".v4_cache.pkl"
+
+# Bump whenever the derived tables change shape or meaning (e.g. key
+# normalization, ideal-target computation) so stale pickles are rebuilt
+_KNOWLEDGE_CACHE_VERSION = 1
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_pickle(path_str: str, mtime: float):
+    """Unpickle a file once per (path, mtime); callers share the result."""
+    with open(path_str, 'rb') as f:
+        return pickle.load(f)
+
+
+def _knowledge_source_mtimes() -> Optional[Tuple[float, ...]]:
+    """Modification times of the book-knowledge files, or None if any is missing."""
+    try:
+        return tuple(p.stat().st_mtime for p in _KNOWLEDGE_FILES)
+    except FileNotFoundError:
+        return None
+
+
+def _read_knowledge_cache(source_mtimes: Optional[Tuple[float, ...]]) -> Optional[Dict]:
+    """Cached book-knowledge tables, or None if missing, unreadable or stale."""
+    if source_mtimes is None:
+        return None  # Take the normal path so missing files are reported
+
+    try:
+        cached = _cached_pickle(str(_KNOWLEDGE_CACHE_FILE), _KNOWLEDGE_CACHE_FILE.stat().st_mtime)
+    except Exception:  # Missing or corrupt cache: rebuild from the JSON files
+        return None
+
+    if (not isinstance(cached, dict)
+            or cached.get('version') != _KNOWLEDGE_CACHE_VERSION
+            or cached.get('mtimes') != source_mtimes):
+        return None
+    return cached
+
+
+def _write_knowledge_cache(source_mtimes: Optional[Tuple[float, ...]], tables: Dict):
+    """Best-effort save of the book-knowledge tables for the next start."""
+    if source_mtimes is None:
+        return
+
+    tmp_file = _KNOWLEDGE_CACHE_FILE.with_suffix('.tmp')
+    try:
+        with open(tmp_file, 'wb') as f:
+            pickle.dump({'version': _KNOWLEDGE_CACHE_VERSION, 'mtimes': source_mtimes, **tables},
+                        f, protocol=5)
+        os.replace(tmp_file, _KNOWLEDGE_CACHE_FILE)
+    except OSError as e:
+        log.debug("Could not write %s: %s", _KNOWLEDGE_CACHE_FILE, e)
+
+
+def _neutral_plausibility(ingredient: str) -> float:
+    """Plausibility when no book data is loaded."""
+    return 0.5
+
+
+class Candidate:
+    """A tested modification: add `amount` ml of `ingredient`."""
+
+    __slots__ = ('ingredient', 'amount', 'improvement', 'original_balance',
+                 'new_balance', 'plausibility', 'combined_score')
+
+    def __init__(self, ingredient: str, amount: float, improvement: float,
+                 original_balance: float, new_balance: float,
+                 plausibility: float = 0.5, combined_score: float = 0.0):
+        self.ingredient = ingredient
+        self.amount = amount
+        self.improvement = improvement
+        self.original_balance = original_balance
+        self.new_balance = new_balance
+        self.plausibility = plausibility
+        self.combined_score = combined_score
+
+    def to_dict(self) -> Dict:
+        """Candidate as a dict, keys in __slots__ order."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# Max memoized get_plausibility_score results per optimizer
+_PLAUS_CACHE_SIZE = 4096
+
+
+def _trigrams(text: str) -> set:
+    """Set of 3-character substrings of text (empty if shorter than 3)."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class FlavorOptimizerV4:
     """
     Enhanced optimizer with book knowledge.
 
-    Inherits multi-recommendation testing from V3.
+    Wraps a V3 optimizer for multi-recommendation testing; any attribute
+    not defined here is delegated to it.
     Adds book-based plausibility scoring.
     """
 
-    def __init__(self):
-        """Initialize V4 optimizer."""
-        super().__init__()
-
-        # Load book knowledge
-        self.ingredient_frequency = self._load_ingredient_frequency()
-        self.ingredient_plausibility = self._load_ingredient_plausibility()
-        self.perfect_cocktails = self._load_perfect_cocktails()
-
-        # Compute ideal targets from perfect cocktails
-        self.ideal_balance_target = self._compute_ideal_balance()
-        self.ideal_taste_distribution = self._compute_ideal_taste_distribution()
+    def __init__(self, data_dir: str = "raw", *, shared_v3: Optional['FlavorOptimizerV3'] = None):
+        """
+        Initialize V4 optimizer.
 
-        print(f"[+] V4 Optimizer initialized")
-        if self.ingredient_frequency:
-            print(f"    - Ingredient frequency data: {len(self.ingredient_frequency)} ingredients")
-        if self.ingredient_plausibility:
-            print(f"    - Plausibility scores: {len(self.ingredient_plausibility)} ingredients")
-        if self.perfect_cocktails:
-            print(f"    - Perfect cocktails: {len(self.perfect_cocktails)} cocktails")
-            print(f"    - Ideal balance target: {self.ideal_balance_target:.3f}")
+        Args:
+            data_dir: Directory containing raw data files
+            shared_v3: Existing V3 optimizer to wrap (profiler, analyzer,
+                modifier and memoized lookups are then shared) instead of
+                building a new one
+        """
+        if shared_v3 is None:
+            # Deferred: importing this module should not pull in the V3 stack
+            from src.recommendation.optimizer_v3 import FlavorOptimizerV3
+            shared_v3 = FlavorOptimizerV3(data_dir)
+        else:
+            # Build the shared V3's lazy components now, so callers that then
+            # use both optimizers from several threads never race to create
+            # them (cached_property is unlocked on Python 3.12+)
+            _ = shared_v3.profiler  # Enhanced profiler (and the FlavorDB load)
+            _ = shared_v3.modifier  # Base profiler, analyzer and modifier
+
+        self._v3 = shared_v3
+
+        # Load book knowledge and the ideal targets derived from it. Warm
+        # starts restore all of it from one pickle keyed by source mtimes.
+        source_mtimes = _knowledge_source_mtimes()
+        knowledge = _read_knowledge_cache(source_mtimes)
+
+        if knowledge is None:
+            self.ingredient_frequency = self._load_ingredient_frequency()
+            self.ingredient_plausibility = self._load_ingredient_plausibility()
+            self.perfect_cocktails = self._load_perfect_cocktails()
+
+            # Compute ideal targets from perfect cocktails
+            self.ideal_balance_target, self.ideal_taste_distribution = self._compute_ideal_targets()
+
+            _write_knowledge_cache(source_mtimes, {
+                'frequency': self.ingredient_frequency,
+                'plausibility': self.ingredient_plausibility,
+                'perfect': self.perfect_cocktails,
+                'balance': self.ideal_balance_target,
+                'taste': self.ideal_taste_distribution,
+            })
+        else:
+            self.ingredient_frequency = knowledge['frequency']
+            self.ingredient_plausibility = knowledge['plausibility']
+            self.perfect_cocktails = knowledge['perfect']
+            self.ideal_balance_target = knowledge['balance']
+            self.ideal_taste_distribution = knowledge['taste']
+
+        # Plausibility lookup tables: interned name -> row of a packed score
+        # array, plus a trigram index over the names for fuzzy lookups
+        self._plaus_keys = [sys.intern(k) for k in self.ingredient_plausibility]
+        self._plaus_idx = {k: i for i, k in enumerate(self._plaus_keys)}
+        self._plaus_vals = np.fromiter(self.ingredient_plausibility.values(),
+                                       dtype=np.float64, count=len(self._plaus_keys))
+        self._trigram_idx, self._short_known = self._build_trigram_index(self._plaus_keys)
+        self._char_idx = self._build_char_index(self._plaus_keys)
+        self._plaus_cache: Dict[str, float] = {}
+
+        # No plausibility data: every ingredient is neutral, skip the lookup
+        if not self._plaus_keys:
+            self.get_plausibility_score = _neutral_plausibility
+
+        # Memoized recommendations for find_best_modification (analyses are
+        # already memoized by V3's _analyze); nothing here mutates them
+        self._recommend = functools.lru_cache(maxsize=256)(self.recommend_improvements)
+
+        log.info("[+] V4 Optimizer initialized")
+        if log.isEnabledFor(logging.INFO):
+            if self.ingredient_frequency:
+                log.info("    - Ingredient frequency data: %d ingredients", len(self.ingredient_frequency))
+            if self.ingredient_plausibility:
+                log.info("    - Plausibility scores: %d ingredients", len(self.ingredient_plausibility))
+            if self.perfect_cocktails:
+                log.info("    - Perfect cocktails: %d cocktails", len(self.perfect_cocktails))
+                log.info("    - Ideal balance target: %.3f", self.ideal_balance_target)
+
+    def __getattr__(self, name: str):
+        # Only reached for attributes V4 does not define itself
+        if name == '_v3':
+            raise AttributeError(name)
+        return getattr(self._v3, name)
 
     def _load_ingredient_frequency(self) -> Dict[str, int]:
         """Load ingredient frequency from book recipes."""
-        freq_file = Path("data/processed/ingredient_frequency.json")
-
-        if not freq_file.exists():
-            print(f"[!] No ingredient frequency data found")
-            print(f"[!] Run: python analyze_book_recipes.py")
+        if not _FREQ_FILE.exists():
+            log.warning("[!] No ingredient frequency data found (run: python analyze_book_recipes.py)")
             return {}
 
-        with open(freq_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return _cached_json(str(_FREQ_FILE), _FREQ_FILE.stat().st_mtime)
 
     def _load_ingredient_plausibility(self) -> Dict[str, float]:
-        """Load ingredient plausibility scores."""
-        plaus_file = Path("data/processed/ingredient_plausibility.json")
-
-        if not plaus_file.exists():
-            print(f"[!] No plausibility data found")
-            print(f"[!] Run: python analyze_book_recipes.py")
+        """Load ingredient plausibility scores, keyed by interned lowercase name."""
+        if not _PLAUS_FILE.exists():
+            log.warning("[!] No plausibility data found (run: python analyze_book_recipes.py)")
             return {}
 
-        with open(plaus_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        # Normalize once here so lookups never need to re-normalize keys
+        raw = _cached_json(str(_PLAUS_FILE), _PLAUS_FILE.stat().st_mtime)
+        return {sys.intern(k.lower().strip()): v for k, v in raw.items()}
 
     def _load_perfect_cocktails(self) -> List[Dict]:
         """Load expert-curated perfect cocktails."""
-        perfect_file = Path("data/processed/perfect_cocktails.json")
-
-        if not perfect_file.exists():
-            print(f"[!] No perfect cocktails data found")
-            print(f"[!] Run: python analyze_book_recipes.py")
+        if not _PERFECT_FILE.exists():
+            log.warning("[!] No perfect cocktails data found (run: python analyze_book_recipes.py)")
             return []
 
-        with open(perfect_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-
-    def _compute_ideal_balance(self) -> float:
-        """Compute ideal balance target from perfect cocktails."""
-        if not self.perfect_cocktails:
-            return 0.98  # Default V3 threshold
+        return _cached_json(str(_PERFECT_FILE), _PERFECT_FILE.stat().st_mtime)
 
-        balances = [c['balance'] for c in self.perfect_cocktails]
-        return sum(balances) / len(balances)
+    def _compute_ideal_targets(self) -> Tuple[float, Dict[str, float]]:
+        """
+        Compute ideal balance target and taste distribution from perfect cocktails.
 
-    def _compute_ideal_taste_distribution(self) -> Dict[str, float]:
-        """Compute ideal taste score distribution from perfect cocktails."""
+        Returns:
+            (mean balance, mean taste score per dimension)
+        """
         if not self.perfect_cocktails:
-            return {}
-
-        taste_dimensions = ['sweet', 'sour', 'bitter', 'aromatic', 'savory']
-        ideal = {}
+            return 0.98, {}  # Default V3 threshold
+
+        # One (N, 1 + dims) matrix: balance followed by taste scores, filled
+        # in a single sweep without per-cocktail row lists
+        n, width = len(self.perfect_cocktails), 1 + len(TASTE_DIMS)
+        values = chain.from_iterable(
+            (c['balance'], *map(c['taste_scores'].__getitem__, TASTE_DIMS))
+            for c in self.perfect_cocktails
+        )
+        matrix = np.fromiter(values, dtype=np.float64, count=n * width).reshape(n, width)
+        means = matrix.mean(axis=0).tolist()
+
+        return means[0], dict(zip(TASTE_DIMS, means[1:]))
+
+    @staticmethod
+    def _build_trigram_index(names: List[str]):
+        """
+        Index known ingredient names by trigram for fuzzy lookups.
 
-        for dim in taste_dimensions:
-            scores = [c['taste_scores'][dim] for c in self.perfect_cocktails]
-            ideal[dim] = sum(scores) / len(scores)
+        Args:
+            names: Known ingredient names
 
-        return ideal
+        Returns:
+            (trigram -> sorted indices into names, indices of names
+            shorter than 3 chars)
+        """
+        trigram_idx = {}
+        short_known = []
+
+        for i, name in enumerate(names):
+            grams = _trigrams(name)
+            if not grams:
+                short_known.append(i)
+            for gram in grams:
+                trigram_idx.setdefault(gram, []).append(i)
+
+        return trigram_idx, short_known
+
+    @staticmethod
+    def _build_char_index(names: List[str]) -> Dict[str, List[int]]:
+        """Map each character to the sorted indices of names containing it."""
+        char_idx = {}
+        for i, name in enumerate(names):
+            for c in set(name):
+                char_idx.setdefault(c, []).append(i)
+        return char_idx
 
     def get_plausibility_score(self, ingredient: str) -> float:
         """
@@ -118,24 +326,74 @@ class FlavorOptimizerV4(FlavorOptimizerV3):
         Returns:
             Plausibility score (0-1), or 0.5 if unknown
         """
-        if not self.ingredient_plausibility:
-            return 0.5  # Neutral if no data
-
-        ingredient_lower = ingredient.lower().strip()
+        score = self._plaus_cache.get(ingredient)
+        if score is not None:
+            return score
+
+        score = self._lookup_plausibility(ingredient)
+
+        # Bounded FIFO: drop the oldest entry once full
+        if len(self._plaus_cache) >= _PLAUS_CACHE_SIZE:
+            try:
+                del self._plaus_cache[next(iter(self._plaus_cache))]
+            except (KeyError, RuntimeError, StopIteration):
+                pass  # Another thread evicted concurrently
+        self._plaus_cache[ingredient] = score
+
+        return score
+
+    def _lookup_plausibility(self, ingredient: str) -> float:
+        """Uncached plausibility lookup: direct match, then fuzzy match."""
+        # Fast path: already canonical (keys are lowercased/stripped at load)
+        i = self._plaus_idx.get(ingredient)
+        if i is not None:
+            return float(self._plaus_vals[i])
+
+        # Only allocate a normalized copy when normalization changes something
+        ingredient_lower = ingredient if ingredient.islower() else ingredient.lower()
+        if ingredient[:1].isspace() or ingredient[-1:].isspace():
+            ingredient_lower = ingredient_lower.strip()
 
         # Direct match
-        if ingredient_lower in self.ingredient_plausibility:
-            return self.ingredient_plausibility[ingredient_lower]
-
-        # Fuzzy match (check if ingredient contains known ingredient)
-        for known_ing, score in self.ingredient_plausibility.items():
-            if known_ing in ingredient_lower or ingredient_lower in known_ing:
-                return score
+        i = self._plaus_idx.get(ingredient_lower)
+        if i is not None:
+            return float(self._plaus_vals[i])
+
+        # Fuzzy match (check if ingredient contains known ingredient, or vice
+        # versa). Either way the two names share every trigram of the shorter
+        # one, so only names sharing a trigram with the ingredient (plus names
+        # too short to have one) can match.
+        grams = _trigrams(ingredient_lower)
+        if grams:
+            candidates = set(self._short_known)
+            for gram in grams:
+                candidates.update(self._trigram_idx.get(gram, ()))
+            candidates = sorted(candidates)  # Keep first-match-wins order
+        elif ingredient_lower:
+            # Too short for trigrams: a name containing the ingredient has all
+            # of its characters; a name inside it is itself short
+            buckets = [self._char_idx.get(c, ()) for c in set(ingredient_lower)]
+            candidates = set(self._short_known).union(set(buckets[0]).intersection(*buckets[1:]))
+            candidates = sorted(candidates)
+        else:
+            candidates = range(len(self._plaus_keys))
+
+        # Only the shorter string can be inside the other, so one substring
+        # test per candidate decides the match
+        n = len(ingredient_lower)
+        for i in candidates:
+            known_ing = self._plaus_keys[i]
+            if len(known_ing) < n:
+                matched = known_ing in ingredient_lower
+            else:
+                matched = ingredient_lower in known_ing
+            if matched:
+                return float(self._plaus_vals[i])
 
         # Unknown ingredient → neutral plausibility
         return 0.5
 
-    def rank_recommendations_with_plausibility(self, candidates: List[Dict]) -> List[Dict]:
+    def rank_recommendations_with_plausibility(self, candidates: List[Candidate]) -> List[Candidate]:
         """
         Rank recommendations by improvement * plausibility.
 
@@ -145,21 +403,25 @@ class FlavorOptimizerV4(FlavorOptimizerV3):
         Returns:
             Sorted candidates (best first)
         """
-        for candidate in candidates:
-            ingredient = candidate['ingredient']
+        n = len(candidates)
+        improvements = np.fromiter((c.improvement for c in candidates), dtype=np.float64, count=n)
+        plausibility = np.fromiter(
+            (self.get_plausibility_score(c.ingredient) for c in candidates),
+            dtype=np.float64, count=n
+        )
 
-            # Get plausibility score
-            plausibility = self.get_plausibility_score(ingredient)
+        # Combined score: improvement * plausibility
+        # This penalizes rare ingredients even if they improve balance
+        combined = improvements * plausibility
 
-            # Combined score: improvement * plausibility
-            # This penalizes rare ingredients even if they improve balance
-            candidate['plausibility'] = plausibility
-            candidate['combined_score'] = candidate['improvement'] * plausibility
+        for candidate, plaus, score in zip(candidates, plausibility.tolist(), combined.tolist()):
+            candidate.plausibility = plaus
+            candidate.combined_score = score
 
-        # Sort by combined score
-        ranked = sorted(candidates, key=lambda x: x['combined_score'], reverse=True)
+        # Sort by combined score, best first (stable: ties keep input order)
+        order = np.argsort(-combined, kind='stable')
 
-        return ranked
+        return [candidates[i] for i in order.tolist()]
 
     def find_best_modification(self, cocktail_name: str, max_candidates: int = 5) -> Dict:
         """
@@ -173,12 +435,12 @@ class FlavorOptimizerV4(FlavorOptimizerV3):
             Best modification result with plausibility info
         """
         # Get initial analysis
-        analysis = self.analyzer.analyze_cocktail_by_name(cocktail_name)
+        analysis = self._analyze(cocktail_name)
 
-        if not analysis:
-            return {'error': 'Cocktail not found'}
+        if 'error' in analysis:
+            return analysis
 
-        original_balance = analysis['balance_metrics']['overall_balance']
+        original_balance = analysis['overall_balance']
 
         # Check if already excellent (use ideal target if available)
         threshold = self.ideal_balance_target if self.perfect_cocktails else 0.98
@@ -192,7 +454,7 @@ class FlavorOptimizerV4(FlavorOptimizerV3):
             }
 
         # Get all recommendations
-        all_recs = self.recommend_improvements(cocktail_name)
+        all_recs = self._recommend(cocktail_name)
 
         if not all_recs or not all_recs.get('recommendations'):
             return {
@@ -201,33 +463,26 @@ class FlavorOptimizerV4(FlavorOptimizerV3):
                 'current_balance': original_balance
             }
 
-        # Test multiple candidates (V3 feature)
-        candidates = []
-
-        for rec in all_recs['recommendations'][:max_candidates]:
-            ingredient = rec['ingredient']
-            amount = rec['amount']
+        # Test multiple candidates (V3 feature). Balances are predicted from
+        # the base analysis in one pass instead of re-analyzing per candidate.
+        recs = all_recs['recommendations'][:max_candidates]
+        new_balances = self._candidate_balances(cocktail_name, analysis, recs)
 
-            # Modify cocktail
-            modification = {
-                'action': 'add',
-                'ingredient': ingredient,
-                'amount': amount
-            }
+        candidates = []
 
-            result = self.modifier.modify_cocktail(cocktail_name, modification)
+        for rec, new_balance in zip(recs, new_balances.tolist()):
+            if np.isnan(new_balance):
+                continue  # NaN: modify_cocktail could not score this one
 
-            if result and 'new_analysis' in result:
-                new_balance = result['new_analysis']['balance_metrics']['overall_balance']
-                improvement = new_balance - original_balance
+            recommendation = rec['recommendation']
 
-                candidates.append({
-                    'ingredient': ingredient,
-                    'amount': amount,
-                    'improvement': improvement,
-                    'original_balance': original_balance,
-                    'new_balance': new_balance
-                })
+            candidates.append(Candidate(
+                ingredient=recommendation['ingredient'],
+                amount=recommendation['amount'],
+                improvement=new_balance - original_balance,
+                original_balance=original_balance,
+                new_balance=new_balance
+            ))
 
         if not candidates:
             return {
@@ -245,15 +500,15 @@ class FlavorOptimizerV4(FlavorOptimizerV3):
             'status': 'success',
             'cocktail': cocktail_name,
             'tested_count': len(candidates),
-            'all_candidates': ranked_candidates,
+            'all_candidates': [c.to_dict() for c in ranked_candidates],
             'best_modification': {
-                'ingredient': best['ingredient'],
-                'amount': best['amount'],
-                'improvement': best['improvement'],
-                'plausibility': best['plausibility'],
-                'combined_score': best['combined_score'],
-                'original_balance': best['original_balance'],
-                'new_balance': best['new_balance']
+                'ingredient': best.ingredient,
+                'amount': best.amount,
+                'improvement': best.improvement,
+                'plausibility': best.plausibility,
+                'combined_score': best.combined_score,
+                'original_balance': best.original_balance,
+                'new_balance': best.new_balance
             }
         }
 
@@ -286,7 +541,7 @@ class FlavorOptimizerV4(FlavorOptimizerV3):
         # Show alternatives
         if len(result['all_candidates']) > 1:
             explanation.append(f"\nOther candidates tested:")
-            for i, cand in enumerate(result['all_candidates'][1:4], 2):  # Show top 2-4
+            for i, cand in enumerate(islice(result['all_candidates'], 1, 4), 2):  # Show top 2-4
                 explanation.append(f"  {i}. {cand['ingredient']}: improvement={cand['improvement']:+.3f}, plausibility={cand['plausibility']:.3f}, score={cand['combined_score']:.3f}")
 
         return '\n'.join(explanation)
@@ -299,8 +554,7 @@ def test_v4_vs_v3():
     print("="*70)
 
     # Check if book data exists
-    book_file = Path("data/book_cocktails.json")
-    if not book_file.exists():
+    if not _BOOK_FILE.exists():
         print("\n[!] No book data found. V4 will behave like V3.")
         print("[!] Extract recipes from ebooks first:")
         print("    python book_extractor_unified.py")
@@ -308,9 +562,11 @@ def test_v4_vs_v3():
         print("    python analyze_book_recipes.py")
         return
 
+    from src.recommendation.optimizer_v3 import FlavorOptimizerV3
+
     # Initialize optimizers
     v3 = FlavorOptimizerV3()
-    v4 = FlavorOptimizerV4()
+    v4 = FlavorOptimizerV4(shared_v3=v3)
 
     # Test cocktails
     test_cocktails = [
@@ -319,18 +575,23 @@ def test_v4_vs_v3():
 
     results = []
 
+    # Cocktails are independent and V4 wraps v3, whose lazy components were
+    # built when v4 was constructed; what the threads then share is
+    # read-only apart from memo caches, so run all V3/V4 searches concurrently
+    with ThreadPoolExecutor(max_workers=len(test_cocktails)) as ex:
+        v3_futures = {c: ex.submit(v3.find_best_modification, c, 5) for c in test_cocktails}
+        v4_futures = {c: ex.submit(v4.find_best_modification, c, 5) for c in test_cocktails}
+
     for cocktail in test_cocktails:
         print(f"\n{'='*70}")
         print(f"Testing: {cocktail}")
         print(f"{'='*70}")
 
-        # V3 recommendation
-        v3_result = v3.find_best_modification(cocktail, max_candidates=5)
+        v3_result = v3_futures[cocktail].result()
+        v4_result = v4_futures[cocktail].result()
 
-        # V4 recommendation
-        v4_result = v4.find_best_modification(cocktail, max_candidates=5)
-
-        if v3_result.get('status') == 'success' and v4_result.get('status') == 'success':
+        # V3 has no 'status'; it reports best_modification=None instead
+        if v3_result.get('best_modification') and v4_result.get('status') == 'success':
             v3_best = v3_result['best_modification']
             v4_best = v4_result['best_modification']
 
@@ -379,16 +640,14 @@ def test_v4_vs_v3():
 
 def main():
     """Test V4 optimizer."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("="*70)
     print("FLAVOR OPTIMIZER V4 - BOOK KNOWLEDGE ENHANCED")
     print("="*70)
 
     # Check prerequisites
-    book_file = Path("data/book_cocktails.json")
-    freq_file = Path("data/processed/ingredient_frequency.json")
-    plaus_file = Path("data/processed/ingredient_plausibility.json")
-
-    if not book_file.exists():
+    if not _BOOK_FILE.exists():
         print("\n[!] Prerequisites not met")
         print("\n1. Extract recipes from ebooks:")
         print("   python book_extractor_unified.py")
@@ -398,7 +657,7 @@ def main():
         print("   python src/recommendation/optimizer_v4.py")
         return
 
-    if not freq_file.exists() or not plaus_file.exists():
+    if not _FREQ_FILE.exists() or not _PLAUS_FILE.exists():
         print("\n[!] Book analysis not complete")
         print("\nRun analysis:")
         print("   python analyze_book_recipes.py")
@@ -411,4 +670,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Run as a script: make the project root importable for the V3 import
+    sys.path.append(str(Path(__file__).parent.parent.parent))
     main()